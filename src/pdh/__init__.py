@@ -14,11 +14,25 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
-from . import transformations as _Transformations
-from .filters import Filter as _Filters
-from .pd import PagerDuty as _PagerDuty
-
 # Exposing Internal things
-Transformations = _Transformations
-Filters = _Filters
-PagerDuty = _PagerDuty
+# resolved on first access (PEP 562): the CLI entrypoint must not pay for pagerduty/jsonpath/dikdik imports
+# when running commands that don't need them (ie: version, config, --help)
+_LAZY = {
+    "Transformations": (".transformations", None),
+    "Filters": (".filters", "Filter"),
+    "PagerDuty": (".pd", "PagerDuty"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    module, attr = _LAZY[name]
+    value = import_module(module, __name__)
+    if attr is not None:
+        value = getattr(value, attr)
+    # cache it, next lookups won't go through __getattr__ again
+    globals()[name] = value
+    return value
@@ -22,6 +22,9 @@ import json
 from rich import print
 
 REQUIRED_KEYS = ["apikey", "uid", "email"]
+# Default upper bound of in-flight requests issued by a single fan-out (pd.PagerDuty max_concurrency).
+# Defined here, not in pd, so the cli can show it without importing the PagerDuty client
+MAX_CONCURRENCY = 8
 
 
 class Config(object):
@@ -16,17 +16,99 @@
 #
 import os
 import re
+import sys
 import time
 from datetime import timezone
-from typing import List, Optional
+from functools import partial
+from operator import itemgetter
+from typing import Dict, List, Optional
 
-from rich.console import Console
+from rich import get_console
+from rich.segment import Segment, Segments
 
 from . import Filters, Transformations
 from .config import Config
 from .filters import Filter
 from .output import print, print_items
-from .pd import DEFAULT_URGENCIES, STATUS_ACK, STATUS_RESOLVED, STATUS_TRIGGERED, URGENCY_HIGH, URGENCY_LOW, PagerDuty, UnauthorizedException
+from .pd import DEFAULT_URGENCIES, MAX_CONCURRENCY, STATUS_ACK, STATUS_RESOLVED, STATUS_TRIGGERED, URGENCY_HIGH, URGENCY_LOW, PagerDuty, UnauthorizedException
+
+# Decorations of the output fields, built once at import time
+STATUS_COLORS = {STATUS_TRIGGERED: "red", STATUS_ACK: "yellow", STATUS_RESOLVED: "green"}
+STATUS_GLYPHS = {STATUS_TRIGGERED: "✘", STATUS_ACK: "✔", STATUS_RESOLVED: "✔"}
+URGENCY_COLORS = {URGENCY_HIGH: "red", URGENCY_LOW: "green"}
+URGENCY_LABELS = {URGENCY_HIGH: "HIGH", URGENCY_LOW: "LOW"}
+# (open, close) markup of an incident title by urgency
+URGENCY_TITLE_STYLE = {URGENCY_HIGH: ("[red]", "[/red]")}
+DEFAULT_TITLE_STYLE = ("[cyan]", "[/cyan]")
+SERVICE_STATUS_COLORS = {"active": "green", "warning": "yellow", "critical": "red", "unknown": "gray", "disabled": "gray"}
+SERVICE_STATUS_LABELS = {"active": "OK", "warning": "WARN", "critical": "CRIT", "unknown": "❔", "disabled": "off"}
+# outputs rendering rich markup, and the ones not announcing the actions applied (their output must stay parseable)
+MARKUP_OUTPUTS = frozenset({"table", "yaml"})
+SILENT_OUTPUTS = frozenset({"yaml", "json"})
+# ANSI sequence erasing the terminal and moving the cursor to the top left corner, between watch ticks
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+# max slow down of the watch interval while incidents don't change (see idle_backoff)
+IDLE_BACKOFF_FACTOR = 8
+# incident fields styled by urgency, and the ones displayed as relative time
+TITLE_FIELDS = frozenset({"title", "urgency"})
+DATE_FIELDS = frozenset({"created_at", "last_status_change_at"})
+
+
+def plain_print(item: dict, fields: List[str]) -> None:
+    """Write the given fields of item on a single line, tab separated (ie output=plain), as they are: no markup, highlighting, wrapping or tabs expansion.
+    The line still goes through the console, keeping its order with the other messages buffered in the same watch tick"""
+    get_console().print(Segments([Segment("\t".join(str(item.get(f, "")) for f in fields) + "\n")]), end="", crop=False)
+
+
+def urgency_style(item: str, d: dict) -> str:
+    """Style a field of incident d (ie: the title) by the incident urgency, used as extract_decorate map_func"""
+    open_tag, close_tag = URGENCY_TITLE_STYLE.get(d.get("urgency"), DEFAULT_TITLE_STYLE)
+    return f"{open_tag}{item}{close_tag}"
+
+
+def split_csv(value: str | List[str] | None, default: List[str] | None = None) -> List[str] | None:
+    """Split a comma separated value (ie: a cli option) into a list of lowercase items, lists are copied and None means default"""
+    if isinstance(value, str):
+        return value.lower().strip().split(",")
+    if value is None:
+        return default
+    return list(value)
+
+
+def announce(ids: List[str], done: Dict[str, bool], action: str, color: str) -> None:
+    """Print the outcome of an action (ack, snooze, resolve...) for each one of the given incident ids"""
+    for i in ids:
+        if done.get(i):
+            print(f"Marked {i} as [{color}]{action}[/{color}]")
+        else:
+            print(f"[red]Failed to mark {i} as {action}[/red]")
+
+
+def find_rules(path: str, dirs: List[str] | None = None) -> List[str]:
+    """
+    Recursively find all the executable files in path, using the stats already returned by scandir.
+    Directories that can't be read are skipped, every directory visited is appended to dirs (if given)
+    """
+    if dirs is not None:
+        dirs.append(path)
+    scripts = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    scripts.extend(find_rules(entry.path, dirs))
+                elif entry.is_file() and entry.stat().st_mode & 0o111:
+                    scripts.append(entry.path)
+    except OSError:
+        pass
+    return scripts
+
+
+def path_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
 
 class PDH(object):
@@ -93,21 +175,12 @@ class PDH(object):
         try:
             pd = PagerDuty(cfg)
             if mine:
-                teams = dict(pd.me)["teams"] if "teams" in pd.me else []
+                teams = dict(pd.me).get("teams", [])
             else:
                 teams = pd.teams.list()
 
             # set fields that will be displayed
-            if type(fields) is str:
-                fields = fields.lower().strip().split(",")
-            else:
-                fields = ["id", "summary", "html_url"]
-
-            def plain_print_f(i):
-                s = ""
-                for f in fields:
-                    s += f"{i[f]}\t"
-                print(s)
+            fields = split_csv(fields, ["id", "summary", "html_url"])
 
             if output != "raw":
                 transformations = dict()
@@ -119,7 +192,7 @@ class PDH(object):
             else:
                 filtered = teams
 
-            print_items(filtered, output, plain_print_f=plain_print_f)
+            print_items(filtered, output, plain_print_f=partial(plain_print, fields=fields))
             return True
         except UnauthorizedException as e:
             print(f"[red]{e}[/red]")
@@ -136,10 +209,7 @@ class PDH(object):
             svcs = Filter.apply(svcs, [Filter.inList("status", status.split(","))])
 
             # set fields that will be displayed
-            if type(fields) is str:
-                fields = fields.lower().strip().split(",")
-            else:
-                fields = ["id", "name", "description", "status", "created_at", "updated_at", "html_url"]
+            fields = split_csv(fields, ["id", "name", "description", "status", "created_at", "updated_at", "html_url"])
 
             if output != "raw":
                 transformations = dict()
@@ -148,11 +218,10 @@ class PDH(object):
                     transformations[f] = Transformations.extract(f)
                     # special cases
                     if f == "status":
-                        transformations[f] = Transformations.extract_decorate(
-                            "status",
-                            color_map={"active": "green", "warning": "yellow", "critical": "red", "unknown": "gray", "disabled": "gray"},
-                            change_map={"active": "OK", "warning": "WARN", "critical": "CRIT", "unknown": "❔", "disabled": "off"},
-                        )
+                        if output in MARKUP_OUTPUTS:
+                            transformations[f] = Transformations.extract_decorate("status", color_map=SERVICE_STATUS_COLORS, change_map=SERVICE_STATUS_LABELS)
+                        else:
+                            transformations[f] = Transformations.extract_change("status", change_map=SERVICE_STATUS_LABELS)
                     if f == "url":
                         transformations[f] = Transformations.extract("html_url")
                     if f in ["created_at", "updated_at"]:
@@ -163,22 +232,10 @@ class PDH(object):
                 # raw output, using json format
                 filtered = svcs
 
-            # define here how print in "plain" way (ie if output=plain)
-            def plain_print_f(i):
-                s = ""
-                for f in fields:
-                    s += f"{i[f]}\t"
-                print(s)
-
             if sort_by:
-                sort_fields: str | list[str] = sort_by.split(",") if "," in sort_by else sort_by
+                filtered = sorted(filtered, key=itemgetter(*sort_by.split(",")), reverse=reverse_sort)
 
-                if isinstance(sort_fields, list) and len(sort_fields) > 1:
-                    filtered = sorted(filtered, key=lambda x: [x[k] for k in sort_fields], reverse=reverse_sort)
-                else:
-                    filtered = sorted(filtered, key=lambda x: x[sort_fields], reverse=reverse_sort)
-
-            print_items(filtered, output, plain_print_f=plain_print_f)
+            print_items(filtered, output, plain_print_f=partial(plain_print, fields=fields))
             return True
 
         except UnauthorizedException as e:
@@ -211,13 +268,16 @@ class PDH(object):
         fields: Optional[List[str]] = None,
         alerts: bool = False,
         alert_fields: Optional[List[str]] = None,
+        alert_concurrency: int = MAX_CONCURRENCY,
         service_re: Optional[str] = None,
         excluded_service_re: Optional[str] = None,
         sort_by: Optional[str] = None,
         reverse_sort: bool = False,
         teams: Optional[str] = None,
+        idle_backoff: bool = False,
     ) -> bool:
-        pd = PagerDuty(cfg)
+        # the HTTP pool is sized for the alerts fan-out
+        pd = PagerDuty(cfg, max_concurrency=alert_concurrency)
 
         # Prepare defaults
         status = [STATUS_TRIGGERED]
@@ -234,204 +294,212 @@ class PDH(object):
 
         try:
             if regexp:
-                filter_re = re.compile(regexp)
+                filter_re = Filters.compile_regexp(regexp)
             if excluded_filter_re:
-                filter_excluded_re = re.compile(excluded_filter_re)
+                filter_excluded_re = Filters.compile_regexp(excluded_filter_re)
+            if service_re:
+                filter_service_re = Filters.compile_regexp(service_re)
+            if excluded_service_re:
+                filter_excluded_service_re = Filters.compile_regexp(excluded_service_re)
         except re.error as e:
             print(f"[red]Invalid regular expression: {str(e)}[/red]")
             return False
 
         incs = []
-        console = Console()
+        # the same console used by print(), so everything printed during a tick is buffered together
+        console = get_console()
         # fallback to configured userid
 
         # set fields that will be displayed
-        if type(fields) is str:
-            fields = fields.lower().strip().split(",")
-        else:
-            fields = ["id", "assignee", "title", "status", "created_at", "service.summary"]
+        fields = split_csv(fields, ["id", "assignee", "title", "status", "created_at", "service.summary"])
         if alerts:
             fields.append("alerts")
 
-        if type(alert_fields) is str:
-            alert_fields = alert_fields.lower().strip().split(",")
-        else:
-            alert_fields = ["status", "created_at", "service.summary", "body.details"]
+        alert_fields = split_csv(alert_fields, ["status", "created_at", "service.summary", "body.details"])
 
-        if type(teams) is str:
-            if teams == "mine":
-                teamNames = dict(pd.me)["teams"] if "teams" in dict(pd.me) else []
-                teams = [t["id"] for t in teamNames if "id" in t]
-            else:
-                teams = teams.lower().strip().split(",")
+        if teams == "mine":
+            me = dict(pd.me)
+            teams = [t["id"] for t in me.get("teams", []) if "id" in t]
+        else:
+            teams = split_csv(teams)
 
         if not everything and not userid:
             userid = pd.cfg["uid"]
-        while True:
-            incs = pd.incidents.list(userid, statuses=status, urgencies=urgencies, teams=teams)
-
-            if rules:
-                scripts = []
-                ppath = os.path.expanduser(os.path.expandvars(rules_path))
-                for root, _, filenames in os.walk(ppath):
-                    for filename in filenames:
-                        fullpath = os.path.join(root, filename)
-                        if os.access(fullpath, os.X_OK):
-                            scripts.append(fullpath)
-
-                if len(scripts) == 0:
-                    print(f"[yellow]No rules found in {ppath}[/yellow]")
 
-                def printFunc(name: str):
-                    print("[green]Applied rule:[/green]", name)
-
-                def errFunc(error: str):
-                    print("[red]Error:[/red]", error)
-
-                ret = pd.incidents.apply(incs, scripts, printFunc, errFunc)
-                if type(ret) is not str:
-                    incs = list(ret)
+        # Build the output transformations once, only the data changes between watch iterations
+        transformations = dict()
+        # rich markup is rendered only by outputs printed through the console, json and plain would show the tags verbatim
+        decorate = output in MARKUP_OUTPUTS
+        if output != "raw":
+            for f in fields:
+                transformations[f] = Transformations.extract(f)
+                # special cases
+                if f == "assignee":
+                    transformations[f] = Transformations.extract_assignees(color="magenta" if decorate else None)
+                if f == "status":
+                    if decorate:
+                        transformations[f] = Transformations.extract_decorate("status", color_map=STATUS_COLORS, default_color="cyan", change_map=STATUS_GLYPHS)
+                    else:
+                        transformations[f] = Transformations.extract_change("status", change_map=STATUS_GLYPHS)
+                if f == "url":
+                    transformations[f] = Transformations.extract("html_url")
+                if f == "urgency" and decorate:
+                    transformations[f] = Transformations.extract_decorate("urgency", color_map=URGENCY_COLORS, change_map=URGENCY_LABELS)
+                if f == "service.summary":
+                    transformations["service"] = Transformations.extract("service.summary")
+                if f in TITLE_FIELDS and decorate:
+                    transformations[f] = Transformations.extract_decorate(f, default_color="cyan", color_map={URGENCY_HIGH: "red"}, map_func=urgency_style)
+                if f in DATE_FIELDS:
+                    transformations[f] = Transformations.extract_date(f, "%Y-%m-%dT%H:%M:%S%z", timezone.utc)
+                if f == "alerts":
+                    transformations[f] = Transformations.extract_alerts(f, alert_fields)
+
+        # plain columns are the keys actually written by the transformations, the same ones shown by table
+        # (ie: service.summary is written as service)
+        plain_print_f = partial(plain_print, fields=list(dict.fromkeys(path.split(".")[0] for path in transformations)))
+
+        # all the filters are evaluated in a single walk over the incidents
+        filters = []
+        if regexp:
+            filters.append(Filters.regexp("title", filter_re))
+        if excluded_filter_re:
+            filters.append(Filters.not_regexp("title", filter_excluded_re))
+        if service_re:
+            filters.append(Filters.regexp("service.summary", filter_service_re))
+        if excluded_service_re:
+            filters.append(Filters.not_regexp("service.summary", filter_excluded_service_re))
+
+        sort_key = itemgetter(*sort_by.split(",")) if sort_by else None
+
+        ppath = os.path.expanduser(os.path.expandvars(rules_path))
+        scripts: List[str] | None = None
+        scripts_dirs: List[str] = []
+        scripts_mtime = None
+
+        def printFunc(name: str):
+            print("[green]Applied rule:[/green]", name)
+
+        def errFunc(error: str):
+            print("[red]Error:[/red]", error)
+
+        next_tick = time.monotonic()
+        interval = timeout
+        last_seen = None
+        while True:
+            # buffer the whole tick output, written at once when leaving the block
+            with console:
+                incs = pd.incidents.list(userid, statuses=status, urgencies=urgencies, teams=teams)
+                if idle_backoff:
+                    # incidents (and their status) seen in this tick, slow down the polling while nothing changes
+                    seen = frozenset((i["id"], i.get("last_status_change_at")) for i in incs)
+                    interval = min(interval * 2, timeout * IDLE_BACKOFF_FACTOR) if seen == last_seen else timeout
+                    last_seen = seen
+
+                if rules:
+                    # rescan only when one of the rules directories changed since the previous tick (rules added, removed or renamed).
+                    # NOTE: making an existing file executable (chmod +x) doesn't change any directory mtime, it's picked up by the next rescan
+                    rules_mtime = [path_mtime(d) for d in scripts_dirs]
+                    if scripts is None or rules_mtime != scripts_mtime:
+                        scripts_dirs = []
+                        scripts = find_rules(ppath, scripts_dirs)
+                        scripts_mtime = [path_mtime(d) for d in scripts_dirs]
+
+                    if len(scripts) == 0:
+                        print(f"[yellow]No rules found in {ppath}[/yellow]")
+
+                    ret = pd.incidents.apply(incs, scripts, printFunc, errFunc)
+                    if not isinstance(ret, str):
+                        incs = list(ret)
+                    else:
+                        print(ret)
+
+                if filters:
+                    incs = Filters.apply(incs, filters=filters)
+
+                if alerts:
+                    for i, a in zip(incs, pd.incidents.bulk_alerts(incs)):
+                        i["alerts"] = a
+
+                # Build filtered list for output
+                if output != "raw":
+                    filtered = Transformations.apply(incs, transformations)
                 else:
-                    print(ret)
-
-            if regexp:
-                incs = Filters.apply(incs, filters=[Filters.regexp("title", filter_re)])
-
-            if excluded_filter_re:
-                incs = Filters.apply(incs, filters=[Filters.not_regexp("title", filter_excluded_re)])
-
-            if service_re:
-                incs = Transformations.apply(incs, {"service": Transformations.extract("service.summary")}, preserve=True)
-                incs = Filters.apply(incs, [Filters.regexp("service", service_re)])
-
-            if excluded_service_re:
-                incs = Transformations.apply(incs, {"service": Transformations.extract("service.summary")}, preserve=True)
-                incs = Filters.apply(incs, [Filters.not_regexp("service", excluded_service_re)])
-
-            if alerts:
-                for i in incs:
-                    i["alerts"] = pd.incidents.alerts(i["id"])
-
-            # Build filtered list for output
-            if output != "raw":
-                transformations = dict()
-                for f in fields:
-                    transformations[f] = Transformations.extract(f)
-                    # special cases
-                    if f == "assignee":
-                        transformations[f] = Transformations.extract_assignees()
-                    if f == "status":
-                        transformations[f] = Transformations.extract_decorate(
-                            "status",
-                            color_map={STATUS_TRIGGERED: "red", STATUS_ACK: "yellow", STATUS_RESOLVED: "green"},
-                            default_color="cyan",
-                            change_map={STATUS_TRIGGERED: "✘", STATUS_ACK: "✔", STATUS_RESOLVED: "✔"},
-                        )
-                    if f == "url":
-                        transformations[f] = Transformations.extract("html_url")
-                    if f == "urgency":
-                        transformations[f] = Transformations.extract_decorate(
-                            "urgency", color_map={URGENCY_HIGH: "red", URGENCY_LOW: "green"}, change_map={URGENCY_HIGH: "HIGH", URGENCY_LOW: "LOW"}
-                        )
-                    if f == "service.summary":
-                        transformations["service"] = Transformations.extract("service.summary")
-                    if f in ["title", "urgency"]:
-
-                        def mapper(item: str, d: dict) -> str:
-                            if "urgency" in d and d["urgency"] == URGENCY_HIGH:
-                                return f"[red]{item}[/red]"
-                            return f"[cyan]{item}[/cyan]"
-
-                        transformations[f] = Transformations.extract_decorate(f, default_color="cyan", color_map={URGENCY_HIGH: "red"}, map_func=mapper)
-                    if f in ["created_at", "last_status_change_at"]:
-                        transformations[f] = Transformations.extract_date(f, "%Y-%m-%dT%H:%M:%S%z", timezone.utc)
-                    if f in ["alerts"]:
-                        transformations[f] = Transformations.extract_alerts(f, alert_fields)
-                filtered = Transformations.apply(incs, transformations)
-            else:
-                # raw output, using json format
-                filtered = incs
-
-            # define here how print in "plain" way (ie if output=plain)
-            def plain_print_f(i):
-                s = ""
-                for f in fields:
-                    s += f"{i[f]}\t"
-                print(s)
-
-            if sort_by:
-                sort_fields: list[str] = sort_by.split(",") if "," in sort_by else [sort_by]
-                try:
-                    filtered = sorted(filtered, key=lambda x: [x[k] for k in sort_fields], reverse=reverse_sort)
-                except KeyError:
-                    print(f"[red]Invalid sort field: {sort_by}[/red]")
-                    print(f"[yellow]Available fields: {', '.join(fields)}[/yellow]")
-                    return False
-
-            print_items(filtered, output, plain_print_f=plain_print_f)
-
-            # now apply actions like snooze, resolve, ack...
-            ids = [i["id"] for i in incs]
-            if ack:
-                pd.incidents.ack(incs)
-                if output not in ["yaml", "json"]:
-                    for i in ids:
-                        print(f"Marked {i} as [yellow]ACK[/yellow]")
-            if snooze:
-                pd.incidents.snooze(incs)
-                if output not in ["yaml", "json"]:
-                    for i in ids:
-                        print(f"Snoozing incident {i} for 4h")
-            if resolve:
-                pd.incidents.resolve(incs)
-                if output not in ["yaml", "json"]:
-                    for i in ids:
-                        print(f"Mark {i} as [green]RESOLVED[/green]")
+                    # raw output, using json format
+                    filtered = incs
+
+                if sort_key:
+                    try:
+                        filtered = sorted(filtered, key=sort_key, reverse=reverse_sort)
+                    except KeyError:
+                        print(f"[red]Invalid sort field: {sort_by}[/red]")
+                        print(f"[yellow]Available fields: {', '.join(fields)}[/yellow]")
+                        return False
+
+                print_items(filtered, output, plain_print_f=plain_print_f, console=console)
+
+                # now apply actions like snooze, resolve, ack...
+                ids = [i["id"] for i in incs] if (ack or snooze or resolve) and output not in SILENT_OUTPUTS else []
+                if ack:
+                    announce(ids, pd.incidents.ack(incs), "ACK", "yellow")
+                if snooze:
+                    announce(ids, pd.incidents.snooze(incs), "SNOOZED (4h)", "blue")
+                if resolve:
+                    announce(ids, pd.incidents.resolve(incs), "RESOLVED", "green")
 
             if not watch:
                 break
-            time.sleep(timeout)
-            console.clear()
+            # schedule on a fixed cadence, if the tick overran start the next one right away (no catch up burst)
+            next_tick = max(next_tick + interval, time.monotonic())
+            try:
+                time.sleep(max(0, next_tick - time.monotonic()))
+            except KeyboardInterrupt:
+                break
+            if console.is_terminal:
+                # erase the screen and move the cursor home with a single write
+                sys.stdout.write(CLEAR_SCREEN)
+                sys.stdout.flush()
+        return True
 
     @staticmethod
     def ack(cfg: Config, incIDs: list = []) -> None:
         pd = PagerDuty(cfg)
-        incs = pd.incidents.list()
-        incs = Filter.apply(incs, filters=[Filter.inList("id", incIDs)])
+        incs = pd.incidents.bulk_get(incIDs)
+        done = pd.incidents.ack(incs)
         for i in incs:
-            print(f"[yellow]✔[/yellow] {i['id']} [grey50]{i['title']}[/grey50]")
-        pd.incidents.ack(incs)
+            mark = "[yellow]✔[/yellow]" if done.get(i["id"]) else "[red]✘[/red]"
+            print(f"{mark} {i['id']} [grey50]{i['title']}[/grey50]")
 
     @staticmethod
     def resolve(cfg: Config, incIDs: list = []) -> None:
         pd = PagerDuty(cfg)
-        incs = pd.incidents.list()
-        incs = Filter.apply(incs, filters=[Filter.inList("id", incIDs)])
+        incs = pd.incidents.bulk_get(incIDs)
+        done = pd.incidents.resolve(incs)
         for i in incs:
-            print(f"[green]✅[/green] {i['id']} [grey50]{i['title']}[/grey50]")
-        pd.incidents.resolve(incs)
+            mark = "[green]✅[/green]" if done.get(i["id"]) else "[red]✘[/red]"
+            print(f"{mark} {i['id']} [grey50]{i['title']}[/grey50]")
 
     @staticmethod
     def snooze(cfg: Config, incIDs: list = [], duration: int = 14400) -> None:
         pd = PagerDuty(cfg)
         import datetime
 
-        incs = pd.incidents.list()
-        incs = Filter.apply(incs, filters=[Filter.inList("id", incIDs)])
+        incs = pd.incidents.bulk_get(incIDs)
+        done = pd.incidents.snooze(incs, duration)
         for id in incIDs:
-            print(f"Snoozing incident {id} for {str(datetime.timedelta(seconds=duration))}")
-
-        pd.incidents.snooze(incs, duration)
+            if done.get(id):
+                print(f"Snoozing incident {id} for {str(datetime.timedelta(seconds=duration))}")
+            else:
+                print(f"[red]Failed to snooze incident {id}[/red]")
 
     @staticmethod
     def reassign(cfg: Config, incIDs: list = [], user: str | None = None):
         pd = PagerDuty(cfg)
-        incs = pd.incidents.list()
-        incs = Filter.apply(incs, filters=[Filter.inList("id", incIDs)])
+        incs = pd.incidents.bulk_get(incIDs)
 
         users = pd.users.id(user)
         if users is None or len(users) == 0:
-            users = pd.users.id(user)
+            # repeating the same (memoized) lookup would return the same, fallback to the email instead
+            users = pd.users.id_by_email(user)
 
         for id in incIDs:
             print(f"Reassign incident {id} to {users}")
@@ -15,10 +15,21 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 import re
+from functools import lru_cache
 from typing import Callable, Iterator, List, Dict, Any
 
 import jsonpath_ng
 
+try:
+    # optional: linear time matching, immune to catastrophic backtracking
+    import re2
+
+    _re2_options = re2.Options()
+    # unsupported patterns fallback to re, don't report them on stderr
+    _re2_options.log_errors = False
+except ImportError:
+    re2 = None
+
 
 class Filter(object):
     """
@@ -38,8 +49,9 @@ class Filter(object):
             Callable[[dict], bool]: A function that takes a dictionary and returns True if the value of the specified field is less than or equal to the given value, otherwise False.
         """
 
+        expr = jsonpath_ng.parse(field)
+
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             if len(values) > 0 and values[0] <= value:
                 return True
@@ -60,8 +72,9 @@ class Filter(object):
             Callable[[dict], bool]: A function that takes a dictionary and returns True if the value of the specified field is greater than or equal to the given value, otherwise False.
         """
 
+        expr = jsonpath_ng.parse(field)
+
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             if len(values) > 0 and values[0] >= value:
                 return True
@@ -82,8 +95,9 @@ class Filter(object):
             Callable[[dict], bool]: A function that takes a dictionary and returns True if the specified field's value is less than the given value, otherwise False.
         """
 
+        expr = jsonpath_ng.parse(field)
+
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             val = values[0] if len(values) > 0 else value
             if val < value:
@@ -105,8 +119,9 @@ class Filter(object):
             Callable[[dict], bool]: A function that takes a dictionary and returns True if the value of the specified field is greater than the given value, otherwise False.
         """
 
+        expr = jsonpath_ng.parse(field)
+
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             val = values[0] if len(values) > 0 else value
             if val > value:
@@ -130,8 +145,9 @@ class Filter(object):
             value of the specified field is in the list of values, otherwise False.
         """
 
+        expr = jsonpath_ng.parse(field)
+
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             val = values[0] if len(values) > 0 else ""
             if val in listOfValues:
@@ -153,8 +169,9 @@ class Filter(object):
             Callable[[dict], bool]: A function that takes a dictionary as input and returns True if the value is found in the specified field, otherwise False.
         """
 
+        expr = jsonpath_ng.parse(field)
+
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             val = values[0] if len(values) > 0 else ""
             if value.lower() in val.lower():
@@ -176,8 +193,9 @@ class Filter(object):
             Callable[[dict], bool]: A function that takes a dictionary and returns True if the value of the specified field matches the given value (case-insensitive), otherwise False.
         """
 
+        expr = jsonpath_ng.parse(field)
+
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             val = values[0] if len(values) > 0 else ""
             if val.lower() == value.lower():
@@ -199,8 +217,9 @@ class Filter(object):
             Callable[[dict], bool]: A function that takes a dictionary and returns True if the specified field's value equals the given value, otherwise False.
         """
 
+        expr = jsonpath_ng.parse(field)
+
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             val = values[0] if len(values) > 0 else None
             if val == value:
@@ -209,6 +228,30 @@ class Filter(object):
 
         return f
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def compile_regexp(pattern: str):
+        """
+        Compiles a regular expression using RE2 (google-re2) when installed, falling back to the re module otherwise
+        or when the pattern uses a syntax not supported by RE2 (ie backreferences, lookarounds).
+        Compiled patterns are memoized, the same pattern is compiled only once.
+
+        Args:
+            pattern (str): The regular expression to compile.
+
+        Returns:
+            A compiled pattern object exposing search().
+
+        Raises:
+            re.error: If the pattern is not a valid regular expression.
+        """
+        if re2 is not None:
+            try:
+                return re2.compile(pattern, _re2_options)
+            except Exception:
+                pass
+        return re.compile(pattern)
+
     @staticmethod
     def regexp(field: str, regexp) -> Callable[[dict], bool]:
         """
@@ -222,14 +265,15 @@ class Filter(object):
             Callable[[dict], bool]: A function that takes a dictionary and returns True if the value of the specified field matches the regular expression, otherwise False.
         """
 
-        if type(regexp) is str:
-            regexp = re.compile(regexp)
+        if isinstance(regexp, str):
+            regexp = Filter.compile_regexp(regexp)
+        search = regexp.search
+        expr = jsonpath_ng.parse(field)
 
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             val = values[0] if len(values) > 0 else ""
-            if regexp.search(val):
+            if search(val):
                 return True
             return False
 
@@ -245,14 +289,15 @@ class Filter(object):
 
             Callable[[dict], bool]: A function that returns False if the regexp is found, True otherwise.
         """
-        if type(regexp) is str:
-            regexp = re.compile(regexp)
+        if isinstance(regexp, str):
+            regexp = Filter.compile_regexp(regexp)
+        search = regexp.search
+        expr = jsonpath_ng.parse(field)
 
         def f(item: dict) -> bool:
-            expr = jsonpath_ng.parse(field)
             values = [match.value for match in expr.find(item)]
             val = values[0] if len(values) > 0 else ""
-            if regexp.search(val):
+            if search(val):
                 return False
             return True
 
@@ -269,10 +314,9 @@ class Filter(object):
             filters (list, optional): A list of filter functions to apply to the objects. Defaults to an empty list.
 
         Returns:
-            list: A list of filtered objects (object for which at least one filter function returned True).
+            list: A list of filtered objects (object for which all the filter functions returned True).
         """
-        ret = objects
-        for filter_func in filters:
-            ret = [o for o in filter(filter_func, ret)]
-
-        return ret
+        if not filters:
+            return objects
+        # single pass: each object is visited once, stopping at the first filter rejecting it
+        return [o for o in objects if all(f(o) for f in filters)]
@@ -19,16 +19,35 @@ import sys
 
 import click
 
-from .config import load_and_validate, setup_config
-from .core import PDH
+from .config import MAX_CONCURRENCY, load_and_validate, setup_config
 from .output import VALID_OUTPUTS
 
 
+# NOTE: .core (and through it pagerduty, jsonpath_ng, dikdik) is imported inside each command,
+# keeping startup fast for commands not talking to PagerDuty (ie: version, config, --help)
+
+
 @click.group(help="PDH - PagerDuty for Humans")
 def main():
     pass
 
 
+def config_group(**attrs):
+    """Declare a sub group of main loading the configuration file (-c/--config) into the context object of its commands"""
+
+    def decorator(f):
+        @click.option("-c", "--config", envvar="PDH_CONFIG", default="~/.config/pdh.yaml", help="Configuration file location (default: ~/.config/pdh.yaml)")
+        @click.pass_context
+        def load_config(ctx, config):
+            ctx.obj = load_and_validate(config)
+            f()
+
+        attrs.setdefault("name", f.__name__)
+        return main.group(**attrs)(load_config)
+
+    return decorator
+
+
 @main.command(help="Create default configuration file")
 @click.option("-c", "--config", default="~/.config/pdh.yaml", help="Configuration file location (default: ~/.config/pdh.yaml)")
 def config(config):
@@ -40,13 +59,9 @@ def version():
     click.echo(f"v{importlib.metadata.version('pdh')}")
 
 
-@main.group(help="Operate on Users")
-@click.option("-c", "--config", envvar="PDH_CONFIG", default="~/.config/pdh.yaml", help="Configuration file location (default: ~/.config/pdh.yaml)")
-@click.pass_context
-def user(ctx, config):
-    cfg = load_and_validate(config)
-    ctx.ensure_object(dict)
-    ctx.obj = cfg
+@config_group(help="Operate on Users")
+def user():
+    pass
 
 
 @user.command(help="List users", name="ls")
@@ -54,6 +69,8 @@ def user(ctx, config):
 @click.option("-o", "--output", "output", help="output format", required=False, type=click.Choice(VALID_OUTPUTS), default="table")
 @click.option("-f", "--fields", "fields", help="Filter fields", required=False, type=str, default=None)
 def user_list(ctx, output, fields):
+    from .core import PDH
+
     if not PDH.list_user(ctx.obj, output, fields):
         sys.exit(1)
 
@@ -64,23 +81,23 @@ def user_list(ctx, output, fields):
 @click.option("-o", "--output", "output", help="output format", required=False, type=click.Choice(VALID_OUTPUTS), default="table")
 @click.option("-f", "--fields", "fields", help="Filter fields", required=False, type=str, default=None)
 def user_get(ctx, user, output, fields):
+    from .core import PDH
+
     if not PDH.get_user(ctx.obj, user, output, fields):
         sys.exit(1)
 
 
-@main.group(help="Operate on Incidents")
-@click.option("-c", "--config", envvar="PDH_CONFIG", default="~/.config/pdh.yaml", help="Configuration file location (default: ~/.config/pdh.yaml)")
-@click.pass_context
-def inc(ctx, config):
-    cfg = load_and_validate(config)
-    ctx.ensure_object(dict)
-    ctx.obj = cfg
+@config_group(help="Operate on Incidents")
+def inc():
+    pass
 
 
 @inc.command(help="Acknowledge specific incidents IDs")
 @click.pass_context
 @click.argument("incidentids", nargs=-1)
 def ack(ctx, incidentids):
+    from .core import PDH
+
     PDH.ack(ctx.obj, incidentids)
 
 
@@ -88,6 +105,8 @@ def ack(ctx, incidentids):
 @click.pass_context
 @click.argument("incidentids", nargs=-1)
 def resolve(ctx, incidentids):
+    from .core import PDH
+
     PDH.resolve(ctx.obj, incidentids)
 
 
@@ -96,6 +115,8 @@ def resolve(ctx, incidentids):
 @click.option("-d", "--duration", required=False, default=14400, help="Duration of snooze in seconds")
 @click.argument("incidentids", nargs=-1)
 def snooze(ctx, incidentids, duration):
+    from .core import PDH
+
     PDH.snooze(ctx.obj, incidentids, duration)
 
 
@@ -104,6 +125,8 @@ def snooze(ctx, incidentids, duration):
 @click.option("-u", "--user", required=True, help="User name or email to assign to (fuzzy find!)")
 @click.argument("incident", nargs=-1)
 def reassign(ctx, incident, user):
+    from .core import PDH
+
     PDH.reassign(ctx.obj, incident, user)
 
 
@@ -119,6 +142,7 @@ def reassign(ctx, incident, user):
 @click.option("-l", "--low", is_flag=True, default=False, help="List only LOW priority incidents")
 @click.option("-w", "--watch", is_flag=True, default=False, help="Continuously print the list")
 @click.option("-t", "--timeout", default=5, help="Watch every x seconds (work only if -w is flagged)")
+@click.option("--idle-backoff", "idle_backoff", is_flag=True, default=False, help="Double the watch interval (up to 8 times --timeout) while incidents don't change")
 @click.option("--rules", is_flag=True, default=False, help="apply rules from a path (see --rules--path")
 @click.option("--rules-path", required=False, default="~/.config/pdh_rules", help="Apply all executable find in this path")
 @click.option("-R", "--regexp", help="regexp to filter incidents", default=None)
@@ -127,23 +151,30 @@ def reassign(ctx, incident, user):
 @click.option("-f", "--fields", "fields", required=False, help="Fields to filter and output", default=None)
 @click.option("--alerts", "alerts", required=False, help="Show alerts associated to each incidents", is_flag=True, default=False)
 @click.option("--alert-fields", "alert_fields", required=False, help="Show these alert fields only, comma separated", default=None)
+@click.option(
+    "--alert-concurrency",
+    "alert_concurrency",
+    required=False,
+    help="Max number of incidents to retrieve alerts for in parallel",
+    type=click.IntRange(min=1),
+    default=MAX_CONCURRENCY,
+    show_default=True,
+)
 @click.option("-S", "--service-re", "service_re", required=False, help="Show only incidents for this service (regexp)", default=None)
 @click.option("--excluded-service-re", "excluded_service_re", required=False, help="Exclude incident of these services (regexp)", default=None)
 @click.option("--sort", "sort_by", required=False, help="Sort by field name", default=None)
 @click.option("--reverse", "reverse_sort", required=False, help="Reverse the sort", is_flag=True, default=False)
 @click.option("-T", "--teams", "teams", required=False, help="Filter only incidents assigned to this team IDs", default=None)
 def list_incidents(ctx, **kwargs):
+    from .core import PDH
+
     if not PDH.list_incidents(ctx.obj, **kwargs):
         sys.exit(1)
 
 
-@main.group(help="Operate on Services", name="svc")
-@click.option("-c", "--config", envvar="PDH_CONFIG", default="~/.config/pdh.yaml", help="Configuration file location (default: ~/.config/pdh.yaml)")
-@click.pass_context
-def svc(ctx, config):
-    cfg = load_and_validate(config)
-    ctx.ensure_object(dict)
-    ctx.obj = cfg
+@config_group(help="Operate on Services", name="svc")
+def svc():
+    pass
 
 
 @svc.command(help="List services", name="ls")
@@ -154,17 +185,15 @@ def svc(ctx, config):
 @click.option("-s", "--status", "status", required=False, help="Filter for service status", default="active,warning,critical")
 @click.pass_context
 def list_services(ctx, output, fields, sort_by, reverse_sort, status):
+    from .core import PDH
+
     if not PDH.list_services(ctx.obj, output, fields, sort_by, reverse_sort, status):
         sys.exit(1)
 
 
-@main.group(help="Operate on Teams", name="teams")
-@click.option("-c", "--config", envvar="PDH_CONFIG", default="~/.config/pdh.yaml", help="Configuration file location (default: ~/.config/pdh.yaml)")
-@click.pass_context
-def teams(ctx, config):
-    cfg = load_and_validate(config)
-    ctx.ensure_object(dict)
-    ctx.obj = cfg
+@config_group(help="Operate on Teams", name="teams")
+def teams():
+    pass
 
 
 @teams.command(help="List teams where current user belongs", name="mine")
@@ -172,6 +201,8 @@ def teams(ctx, config):
 @click.option("-f", "--fields", "fields", required=False, help="Fields to filter and output", default=None)
 @click.pass_context
 def teams_mine(ctx, output, fields) -> None:
+    from .core import PDH
+
     if not PDH.list_teams(ctx.obj, mine=True, output=output, fields=fields):
         sys.exit(1)
 
@@ -181,5 +212,7 @@ def teams_mine(ctx, output, fields) -> None:
 @click.option("-f", "--fields", "fields", required=False, help="Fields to filter and output", default=None)
 @click.pass_context
 def teams_list(ctx, output, fields) -> None:
+    from .core import PDH
+
     if not PDH.list_teams(ctx.obj, mine=False, output=output, fields=fields):
         sys.exit(1)
@@ -15,12 +15,14 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 import subprocess
-from typing import Any, Dict, Iterator, List, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Callable
 from rich import print
 from pagerduty import RestApiV2Client, Error
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 import json
-from .config import Config
-from functools import lru_cache
+from .config import MAX_CONCURRENCY, Config
+from functools import wraps
 import time
 
 
@@ -38,9 +40,72 @@ STATUS_RESOLVED = "resolved"
 DEFAULT_STATUSES = [STATUS_TRIGGERED, STATUS_ACK]
 DEFAULT_URGENCIES = [URGENCY_HIGH, URGENCY_LOW]
 
+# Seconds to keep slowly-changing catalog data (users, teams, services)
+CATALOG_TTL = 60
 
-def ttl_hash(seconds=30):
-    return round(time.time() / seconds)
+# Max number of incidents accepted by PagerDuty in a single bulk update (PUT /incidents)
+BULK_UPDATE_LIMIT = 250
+
+
+def ttl_cache(seconds: int = CATALOG_TTL) -> Callable:
+    """
+    Memoize the decorated function for the given amount of seconds.
+    If the API call fails once expired, the last known value is returned instead (stale-if-error).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        cache: Dict[tuple, tuple] = {}
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # keep the instance itself in the key (like lru_cache does), arguments may be unhashable (ie dict params)
+            key = (args[:1], repr((args[1:], sorted(kwargs.items()))))
+            now = time.monotonic()
+            if key in cache and cache[key][0] > now:
+                return cache[key][1]
+            try:
+                ret = func(*args, **kwargs)
+            except Error:
+                if key in cache:
+                    return cache[key][1]
+                raise
+            cache[key] = (now + seconds, ret)
+            return ret
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def concurrently(func: Callable[[Any], Any], items: Iterable[Any], max_workers: int = MAX_CONCURRENCY) -> List[Any]:
+    """
+    Call func over every item using a bounded pool of threads.
+    API calls are I/O bound, so the aggregated latency is roughly the one of the slowest call instead of the sum of all of them.
+    Results are returned in the same order of the given items.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(i) for i in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def report(errors: Iterable[Exception | None]) -> None:
+    """
+    Print the errors returned by the workers of concurrently().
+    Workers must not print by themselves: rich's console buffer (ie a watch tick) is thread local, their output would skip it.
+    """
+    for e in errors:
+        if e is not None:
+            print(str(e))
+
+
+def chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split items in lists of at most size elements"""
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
 
 
 class RuleExecutionError(Exception):
@@ -64,15 +129,20 @@ class PagerDuty(object):
     DEFAULT_STATUSES = DEFAULT_STATUSES
     DEFAULT_URGENCIES = DEFAULT_URGENCIES
 
-    def __init__(self, cfg: Config) -> None:
+    def __init__(self, cfg: Config, max_concurrency: int = MAX_CONCURRENCY) -> None:
         super().__init__()
 
         self.cfg: Config = cfg
         self.session: RestApiV2Client = RestApiV2Client(cfg["apikey"], default_from=cfg["email"])
         self.session.max_network_attempts = 5
+        # retry transient gateway errors too (429 is always retried by the client)
+        self.session.retry.update({502: 3, 503: 3, 504: 3})
+        # keep-alive pool at least as large as the concurrent fan-outs (max_concurrency requests at once),
+        # otherwise the extra connections are opened and dropped at every call. Never smaller than the requests default
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=max(DEFAULT_POOLSIZE, max_concurrency)))
         self.users = Users(self.cfg, self.session)
         self.services = Services(self.cfg, self.session)
-        self.incidents = Incidents(self.cfg, self.session)
+        self.incidents = Incidents(self.cfg, self.session, max_concurrency)
         self.teams = Teams(self.cfg, self.session)
         try:
             self.abilities: List | Dict = self.session.rget("/abilities")
@@ -85,9 +155,13 @@ class PagerDuty(object):
 
 
 class Incidents(object):
-    def __init__(self, cfg: Config, session: RestApiV2Client) -> None:
+    def __init__(self, cfg: Config, session: RestApiV2Client, max_concurrency: int = MAX_CONCURRENCY) -> None:
         self.cfg = cfg
         self.session = session
+        # max number of concurrent requests of the fan-outs, the session pool must be at least as large
+        self.max_concurrency = max_concurrency
+        # incident id -> (signature, alerts) of the last bulk_alerts() call
+        self._alerts: Dict[str, tuple] = {}
 
     def list(self, userid: list | None = None, statuses: list = DEFAULT_STATUSES, urgencies: list = DEFAULT_URGENCIES, teams=None) -> List[Any]:
         """List all incidents"""
@@ -106,37 +180,90 @@ class Incidents(object):
         r = self.session.rget(f"/incidents/{id}/alerts")
         return r
 
+    def bulk_alerts(self, incs: List[Dict], max_workers: int | None = None) -> List[Dict | List]:
+        """
+        Retrieve the alerts of many incidents at once, in the same order of the given incidents.
+        Each incident is fetched once, alerts of incidents not changed since the previous call are reused.
+        """
+
+        def signature(i: Dict) -> str | None:
+            if "alert_counts" not in i:
+                return None
+            return f"{i.get('last_status_change_at')}/{i['alert_counts']}"
+
+        known = self._alerts
+        self._alerts = {}
+        missing = {}
+        for i in incs:
+            sig = signature(i)
+            if sig is not None and i["id"] in known and known[i["id"]][0] == sig:
+                self._alerts[i["id"]] = known[i["id"]]
+            else:
+                missing[i["id"]] = sig
+
+        for (id, sig), alerts in zip(missing.items(), concurrently(self.alerts, missing.keys(), max_workers or self.max_concurrency)):
+            self._alerts[id] = (sig, alerts)
+
+        return [self._alerts[i["id"]][1] for i in incs]
+
     def get(self, id: str) -> Dict | List:
         """Retrieve a single incident by ID"""
         r = self.session.rget(f"/incidents/{id}")
         return r
 
-    def ack(self, incs) -> None:
-        self.change_status(incs, STATUS_ACK)
+    def bulk_get(self, ids: Iterable[str], statuses: List = DEFAULT_STATUSES) -> List[Dict]:
+        """
+        Retrieve many incidents by ID at once, like list() only the incidents in one of the given statuses are returned.
+        IDs not found are skipped, any other API error is raised.
+        """
+
+        def f(id: str) -> Dict | None:
+            try:
+                return self.get(id)
+            except Error as e:
+                if e.response is not None and e.response.status_code == 404:
+                    return None
+                raise
+
+        return [i for i in concurrently(f, dict.fromkeys(ids), self.max_concurrency) if i and i.get("status") in statuses]
 
-    def resolve(self, incs) -> None:
-        self.change_status(incs, STATUS_RESOLVED)
+    def ack(self, incs) -> Dict[str, bool]:
+        return self.change_status(incs, STATUS_ACK)
 
-    def change_status(self, incs, status: str = STATUS_ACK) -> None:
+    def resolve(self, incs) -> Dict[str, bool]:
+        return self.change_status(incs, STATUS_RESOLVED)
+
+    def change_status(self, incs, status: str = STATUS_ACK) -> Dict[str, bool]:
         for i in incs:
             if "status" in i:
                 i["status"] = status
 
-        self.bulk_update(incs)
+        return self.bulk_update(incs)
 
-    def snooze(self, incs, duration=14400) -> None:
-        for i in incs:
+    def snooze(self, incs, duration=14400) -> Dict[str, bool]:
+        def f(i) -> Exception | None:
             try:
                 self.session.post(f"/incidents/{i['id']}/snooze", json={"duration": duration})
+                return None
             except Exception as e:
-                print(e)
+                return e
 
-    def bulk_update(self, incs):
-        ret = None
-        try:
-            ret = self.session.rput("incidents", json=incs)
-        except Error as e:
-            print(e)
+        errors = concurrently(f, incs, self.max_concurrency)
+        report(errors)
+        return {i["id"]: e is None for i, e in zip(incs, errors)}
+
+    def bulk_update(self, incs) -> Dict[str, bool]:
+        """Update incidents with one request every BULK_UPDATE_LIMIT of them, returns whether the update succeeded for each incident ID"""
+        ret = {}
+        for chunk in chunks(incs, BULK_UPDATE_LIMIT):
+            try:
+                self.session.rput("incidents", json=chunk)
+                ok = True
+            except Error as e:
+                print(e)
+                ok = False
+            for i in chunk:
+                ret[i["id"]] = ok
         return ret
 
     def update(self, inc):
@@ -148,8 +275,9 @@ class Incidents(object):
         return ret
 
     def reassign(self, incs, uids: List[str]) -> None:
-        for i in incs:
-            assignments = [{"assignee": {"id": u, "type": "user_reference"}} for u in uids]
+        assignments = [{"assignee": {"id": u, "type": "user_reference"}} for u in uids]
+
+        def f(i) -> Exception | None:
             new_inc = {
                 "id": i["id"],
                 "type": "incident_reference",
@@ -157,8 +285,11 @@ class Incidents(object):
             }
             try:
                 self.session.rput(f"/incidents/{i['id']}", json=new_inc)
+                return None
             except Exception as e:
-                print(str(e))
+                return e
+
+        report(concurrently(f, incs, self.max_concurrency))
 
     def apply(self, incs: List[Any] | Dict[Any, Any] | Iterator[Any], paths: List[str], printFunc, errFunc: Callable) -> List[Any] | Dict[Any, Any] | Iterator[Any]:
         try:
@@ -194,20 +325,18 @@ class Users(object):
         self.cfg = cfg
         self.session = session
 
-    @lru_cache()
-    def list(self, ttl=ttl_hash()) -> List[Dict] | Iterator[Dict]:
+    @ttl_cache()
+    def list(self) -> List[Dict] | Iterator[Dict]:
         """List all users in PagerDuty account"""
-        users = self.session.iter_all("users")
-
-        return users
+        return list(self.session.iter_all("users"))
 
-    @lru_cache()
-    def get(self, id: str, ttl=ttl_hash()) -> Dict | List:
+    @ttl_cache()
+    def get(self, id: str) -> Dict | List:
         """Get a single user by ID"""
         return self.session.rget(f"/users/{id}")
 
-    @lru_cache()
-    def search(self, query: str, key: str = "name", ttl=ttl_hash()) -> List[dict]:
+    @ttl_cache()
+    def search(self, query: str, key: str = "name") -> List[dict]:
         """Retrieve all users matching query on the attribute name"""
 
         def equiv(s) -> bool:
@@ -216,20 +345,20 @@ class Users(object):
         users = [u for u in filter(equiv, self.session.iter_all("users"))]
         return users
 
-    @lru_cache()
-    def id(self, query: str, key: str = "name", ttl=ttl_hash()) -> List[str]:
+    @ttl_cache()
+    def id(self, query: str, key: str = "name") -> List[str]:
         """Retrieve all userIDs matching query on the attribute name"""
         users = self.search(query, key)
         userIDs = [u["id"] for u in users]
         return userIDs
 
-    @lru_cache()
-    def id_by_email(self, query, ttl=ttl_hash()):
+    @ttl_cache()
+    def id_by_email(self, query):
         """Retrieve all usersIDs matching the given (partial) email"""
         return self.id(query, "email")
 
-    @lru_cache()
-    def teams(self, name: str, ttl=ttl_hash()) -> List[Dict]:
+    @ttl_cache()
+    def teams(self, name: str) -> List[Dict]:
         """Retrieve all teams for a given user"""
         users = self.search(query=name)
         teams = []
@@ -237,8 +366,8 @@ class Users(object):
             teams.append(user["teams"])
         return teams
 
-    @lru_cache()
-    def team_id(self, name: str, ttl=ttl_hash()) -> List[str]:
+    @ttl_cache()
+    def team_id(self, name: str) -> List[str]:
         """Retrieve all team IDs for a given user"""
         teams = self.teams(name)
         teamIDs = [team["id"] for team in teams]
@@ -250,18 +379,21 @@ class Services(object):
         self.cfg = cfg
         self.session = session
 
+    @ttl_cache()
     def list(self, params: dict | None = None) -> List[Dict] | Iterator[Dict]:
         """List all services in PagerDuty account"""
         if params:
             services = self.session.iter_all("services", params=params)
         else:
             services = self.session.iter_all("services")
-        return services
+        return list(services)
 
+    @ttl_cache()
     def get(self, id: str) -> Dict | List:
         """Get a single service by ID"""
         return self.session.rget(f"/services/{id}")
 
+    @ttl_cache()
     def search(self, query: str, key: str = "name") -> List[dict]:
         """Retrieve all services matching query on the attribute name"""
 
@@ -271,6 +403,7 @@ class Services(object):
         services = [u for u in filter(equiv, self.session.iter_all("services"))]
         return services
 
+    @ttl_cache()
     def id(self, query: str, key: str = "name") -> List[str]:
         """Retrieve all serviceIDs matching query on the attribute name"""
         services = self.search(query, key)
@@ -283,20 +416,18 @@ class Teams(object):
         self.cfg = cfg
         self.session = session
 
-    @lru_cache()
-    def list(self, ttl=ttl_hash()) -> List[Dict] | Iterator[Dict]:
+    @ttl_cache()
+    def list(self) -> List[Dict] | Iterator[Dict]:
         """List all teams in PagerDuty account"""
-        users = self.session.iter_all("teams")
+        return list(self.session.iter_all("teams"))
 
-        return users
-
-    @lru_cache()
-    def get(self, id: str, ttl=ttl_hash()) -> Dict | List:
+    @ttl_cache()
+    def get(self, id: str) -> Dict | List:
         """Get a single team by ID"""
         return self.session.rget(f"/teams/{id}")
 
-    @lru_cache()
-    def search(self, query: str, key: str = "name", ttl=ttl_hash()) -> List[dict]:
+    @ttl_cache()
+    def search(self, query: str, key: str = "name") -> List[dict]:
         """Retrieve all teams matching query on the attribute name"""
 
         def equiv(s) -> bool:
@@ -305,8 +436,8 @@ class Teams(object):
         teams = [u for u in filter(equiv, self.session.iter_all("teams"))]
         return teams
 
-    @lru_cache()
-    def id(self, query: str, key: str = "name", ttl=ttl_hash()) -> List[str]:
+    @ttl_cache()
+    def id(self, query: str, key: str = "name") -> List[str]:
         """Retrieve all teams id matching query on the attribute name"""
         teams = self.search(query, key)
         teamids = [u["id"] for u in teams]
@@ -97,9 +97,10 @@ def chain(incs: list, path: str, pd: PagerDuty | None = None):
     return None
 
 
+@functools.lru_cache(maxsize=4)
 def client(config_file: str = "~/.config/pdh.yaml") -> PagerDuty:
     """
-    Initialize the Pagerduty APIs in a more easy way
+    Initialize the Pagerduty APIs in a more easy way, the same instance (and HTTP session) is returned for the same config_file
       Parameters:
         config_file (str): the file path with pdh configuration (default: ~/.config/pdh.yaml)
       Returns:
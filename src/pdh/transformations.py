@@ -26,6 +26,9 @@ from rich.pretty import pretty_repr
   Almost all functions here are meant to be used with apply() function
 """
 
+# ISO-8601 formats (as returned by PagerDuty APIs) parsed with datetime.fromisoformat instead of the much slower strptime
+ISO_FORMATS = {"%Y-%m-%dT%H:%M:%S%z": False, "%Y-%m-%dT%H:%M:%SZ": True}
+
 
 def apply(
     objects: List[Any] | List[Dict[Any, Any]] | Iterator[Any], transformers: Dict[str, Callable[[Dict], Any]] | None = None, preserve: bool = False
@@ -47,16 +50,22 @@ def apply(
       List[Any] | List[Dict[Any, Any]] | Iterator[Any]:
         A list or iterator of transformed objects.
     """
-    ret = list()
+    if transformers is None:
+        return list(objects)
 
+    # resolved once instead of for every object: only dotted paths need DikDik to build the nested fields
+    steps = tuple((path, func, "." in path) for path, func in transformers.items())
+    set_path = DikDik.set_path
+
+    ret = list()
     for obj in objects:
-        if transformers is not None:
-            item = obj if preserve else {}
-            for path, func in transformers.items():
-                DikDik.set_path(item, path, func(obj))
-            ret.append(item)
-        else:
-            ret.append(obj)
+        item = obj if preserve else {}
+        for path, func, nested in steps:
+            if nested:
+                set_path(item, path, func(obj))
+            else:
+                item[path] = func(obj)
+        ret.append(item)
 
     return ret
 
@@ -101,10 +110,12 @@ def extract_change(
       KeyError: If the specified path does not exist in the dictionary and no default value is provided.
     """
 
+    # parse once, the returned function is called for every item
+    expr = jsonpath_ng.parse(path)
+
     def f(i: dict) -> Any:
         try:
             # recursively return inner fields if they exist in the form of "field.subfield"
-            expr = jsonpath_ng.parse(path)
             matches = [match.value for match in expr.find(i)]
             if not matches:
                 if default is not None:
@@ -132,12 +143,26 @@ def extract_date(field_name: str, format: str = "%Y-%m-%dT%H:%M:%SZ", tz: timezo
       - Callable[[Dict], Any]: A function that takes a dictionary and returns a human-readable relative time string.
     """
 
+    expr = jsonpath_ng.parse(field_name)
+
+    if format in ISO_FORMATS:
+        # a literal trailing Z means a naive datetime is expected
+        naive = ISO_FORMATS[format]
+
+        def parse(val: str) -> datetime:
+            d = datetime.fromisoformat(val)
+            return d.replace(tzinfo=None) if naive else d
+
+    else:
+
+        def parse(val: str) -> datetime:
+            return datetime.strptime(val, format)
+
     def f(i: dict) -> str:
-        expr = jsonpath_ng.parse(field_name)
         val = [match.value for match in expr.find(i)][0]
 
         # val = DikDik.get_path(i, field_name)
-        duration = datetime.now(tz) - datetime.strptime(val, format)
+        duration = datetime.now(tz) - parse(val)
         date = {}
         date["d"], remaining = divmod(duration.total_seconds(), 86_400)
         date["h"], remaining = divmod(remaining, 3_600)
@@ -174,8 +199,9 @@ def extract_decorate(
     - Callable: A function that takes a dictionary and returns the transformed field value as a string.
     """
 
+    expr = jsonpath_ng.parse(field_name)
+
     def f(i: dict) -> str:
-        expr = jsonpath_ng.parse(field_name)
         item = [match.value for match in expr.find(i)][0]
         # item = DikDik.get_path(i, field_name)
 
@@ -211,16 +237,20 @@ def extract_decorate(
     return f
 
 
-def extract_assignees(color: str = "magenta") -> Callable[[dict], str]:
+def extract_assignees(color: str | None = "magenta") -> Callable[[dict], str]:
     def f(i: dict) -> str:
-        return f"[{color}]{', '.join([a['assignee']['summary'] for a in i['assignments']])}[/{color}]"
+        assignees = ", ".join([a["assignee"]["summary"] for a in i["assignments"]])
+        if color is None:
+            return assignees
+        return f"[{color}]{assignees}[/{color}]"
 
     return f
 
 
 def extract_alerts(field_name, alert_fields: list[str] = ["id", "summary", "created_at", "status"]):
+    expr = jsonpath_ng.parse(field_name)
+
     def f(i: dict) -> str:
-        expr = jsonpath_ng.parse(field_name)
         alerts = [match.value for match in expr.find(i)][0]
         # alerts = DikDik.get_path(i, field_name)
         ret = dict()
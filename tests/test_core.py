@@ -14,9 +14,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import json
+import os
 import pytest
+import yaml
 from unittest.mock import patch, MagicMock
-from pdh.core import PDH
+from pdh.core import CLEAR_SCREEN, PDH, find_rules, plain_print, split_csv, urgency_style
 from pdh.config import Config
 
 
@@ -42,3 +45,221 @@ def test_list_user_with_fields_list(mock_config, mock_users):
     result = PDH.list_user(mock_config, "raw", fields=fields)
     mock_users.assert_called_once()
     assert result is True
+
+
+@pytest.fixture
+def incidents():
+    with open("tests/incidents_list.json", "r") as f:
+        return json.load(f)
+
+
+def test_list_incidents_filters(mock_config, mock_users, incidents, capsys):
+    mock_users.return_value.incidents.list.return_value = incidents
+    assert PDH.list_incidents(mock_config, output="plain", fields="id,title,status", regexp="cassandra", excluded_service_re="high", sort_by="id") is True
+    out = capsys.readouterr().out
+    assert "Q3W0XN8XORAH3J" in out
+    assert "Q0VVEEB5HX4U06" not in out
+
+
+def test_list_incidents_watch_interrupted(mock_config, mock_users, incidents):
+    mock_users.return_value.incidents.list.return_value = incidents
+    with patch("pdh.core.time.sleep", side_effect=KeyboardInterrupt) as sleep:
+        assert PDH.list_incidents(mock_config, output="raw", watch=True, timeout=5) is True
+    assert 0 < sleep.call_args.args[0] <= 5
+
+
+def test_list_incidents_idle_backoff(mock_config, mock_users, incidents):
+    changed = [dict(incidents[0], last_status_change_at="2025-01-01T00:00:00Z")] + incidents[1:]
+    mock_users.return_value.incidents.list.side_effect = [incidents] * 5 + [changed]
+    now = [0.0]
+    intervals = []
+
+    def sleep(seconds):
+        intervals.append(seconds)
+        if len(intervals) == 6:
+            raise KeyboardInterrupt
+        now[0] += seconds
+
+    with patch("pdh.core.time.sleep", side_effect=sleep), patch("pdh.core.time.monotonic", side_effect=lambda: now[0]):
+        PDH.list_incidents(mock_config, output="raw", watch=True, timeout=5, idle_backoff=True)
+    assert intervals == [5, 10, 20, 40, 40, 5]
+
+
+def test_list_incidents_watch_clear(mock_config, mock_users, incidents, capsys):
+    mock_users.return_value.incidents.list.return_value = incidents
+    with patch("pdh.core.time.sleep", side_effect=[None, KeyboardInterrupt]), patch("pdh.core.get_console") as console:
+        console.return_value.is_terminal = True
+        PDH.list_incidents(mock_config, output="raw", watch=True, timeout=5)
+    assert capsys.readouterr().out == CLEAR_SCREEN
+
+
+def test_list_incidents_alert_concurrency(mock_config, mock_users, incidents):
+    mock_users.return_value.incidents.list.return_value = incidents
+    PDH.list_incidents(mock_config, output="raw", alerts=True, alert_concurrency=32)
+    # the client (and its HTTP pool) is sized for the alerts fan-out
+    assert mock_users.call_args.kwargs["max_concurrency"] == 32
+    mock_users.return_value.incidents.bulk_alerts.assert_called_once_with(incidents)
+
+
+def test_list_incidents_invalid_sort(mock_config, mock_users, incidents):
+    mock_users.return_value.incidents.list.return_value = incidents
+    assert PDH.list_incidents(mock_config, output="table", sort_by="nope") is False
+
+
+def test_list_incidents_service_filter(mock_config, mock_users, incidents, capsys):
+    mock_users.return_value.incidents.list.return_value = incidents
+    PDH.list_incidents(mock_config, output="yaml", service_re="SAAS", excluded_filter_re="AWS")
+    out = capsys.readouterr().out
+    assert "Q3W0XN8XORAH3J" in out
+    assert "SAAS low priority" in out
+    assert "Q0VVEEB5HX4U06" not in out
+
+
+def test_list_incidents_json_undecorated(mock_config, mock_users, incidents, capsys):
+    mock_users.return_value.incidents.list.return_value = incidents
+    PDH.list_incidents(mock_config, output="json", fields="id,assignee,title,status,urgency")
+    items = json.loads(capsys.readouterr().out)
+    assert len(items) == len(incidents)
+    for item in items:
+        assert "[/" not in "".join(item.values())
+
+
+def test_list_incidents_urgency_outputs(mock_config, mock_users, incidents, capsys):
+    # the same values whatever the output format, decorations apart
+    mock_users.return_value.incidents.list.return_value = incidents
+    expected = [i["urgency"] for i in incidents]
+    PDH.list_incidents(mock_config, output="json", fields="urgency")
+    assert [i["urgency"] for i in json.loads(capsys.readouterr().out)] == expected
+    PDH.list_incidents(mock_config, output="yaml", fields="urgency")
+    assert [i["urgency"] for i in yaml.safe_load(capsys.readouterr().out)] == expected
+    PDH.list_incidents(mock_config, output="plain", fields="urgency")
+    assert capsys.readouterr().out.splitlines() == expected
+
+
+def test_list_incidents_plain_default_fields(mock_config, mock_users, incidents, capsys):
+    mock_users.return_value.incidents.list.return_value = incidents
+    PDH.list_incidents(mock_config, output="plain")
+    rows = [line.split("\t") for line in capsys.readouterr().out.splitlines()]
+    assert [r[0] for r in rows] == [i["id"] for i in incidents]
+    # id, assignee, title, status, created_at, service
+    assert [r[5] for r in rows] == [i["service"]["summary"] for i in incidents]
+
+
+def test_list_incidents_ack(mock_config, mock_users, incidents, capsys):
+    mock_users.return_value.incidents.list.return_value = incidents
+    mock_users.return_value.incidents.ack.return_value = {incidents[0]["id"]: True}
+    PDH.list_incidents(mock_config, output="yaml", ack=True)
+    assert "Marked" not in capsys.readouterr().out
+    PDH.list_incidents(mock_config, output="plain", fields="id", ack=True)
+    out = capsys.readouterr().out
+    assert f"Marked {incidents[0]['id']} as ACK" in out
+    assert f"Failed to mark {incidents[1]['id']} as ACK" in out
+
+
+def test_list_services_plain(mock_config, mock_users, capsys):
+    svc = {
+        "id": "S1",
+        "name": "svc",
+        "description": "d",
+        "status": "active",
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        "html_url": "u",
+    }
+    mock_users.return_value.services.list.return_value = [svc]
+    assert PDH.list_services(mock_config, output="plain") is True
+    out = capsys.readouterr().out
+    assert out.startswith("S1\tsvc\td\tOK\t")
+    assert "[/" not in out
+
+
+def test_list_incidents_plain_order(mock_config, mock_users, incidents, capsys):
+    mock_users.return_value.incidents.list.return_value = incidents
+    mock_users.return_value.incidents.apply.return_value = incidents
+    PDH.list_incidents(mock_config, output="plain", fields="id", rules=True, rules_path="/nonexistent")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == ["No rules found in /nonexistent"] + [i["id"] for i in incidents]
+
+
+def test_find_rules(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name, mode in [("a.py", 0o755), ("b.txt", 0o644), ("sub/c.py", 0o700)]:
+        (tmp_path / name).write_text("")
+        os.chmod(tmp_path / name, mode)
+    assert sorted(find_rules(str(tmp_path))) == [str(tmp_path / "a.py"), str(tmp_path / "sub" / "c.py")]
+    assert find_rules(str(tmp_path / "missing")) == []
+    dirs = []
+    find_rules(str(tmp_path), dirs)
+    assert sorted(dirs) == [str(tmp_path), str(tmp_path / "sub")]
+
+
+def test_find_rules_unreadable(tmp_path):
+    (tmp_path / "locked").mkdir()
+    (tmp_path / "a.py").write_text("")
+    os.chmod(tmp_path / "a.py", 0o755)
+    scandir = os.scandir
+
+    def locked_scandir(path):
+        if path.endswith("locked"):
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    with patch("pdh.core.os.scandir", side_effect=locked_scandir):
+        assert find_rules(str(tmp_path)) == [str(tmp_path / "a.py")]
+
+
+def test_list_incidents_rules_rescan(mock_config, mock_users, incidents, tmp_path):
+    (tmp_path / "sub").mkdir()
+    mock_users.return_value.incidents.list.return_value = incidents
+    mock_users.return_value.incidents.apply.return_value = incidents
+
+    def sleep(_):
+        # a new rule in a subdirectory while watching
+        if not (tmp_path / "sub" / "new.py").exists():
+            (tmp_path / "sub" / "new.py").write_text("")
+            os.chmod(tmp_path / "sub" / "new.py", 0o755)
+        else:
+            raise KeyboardInterrupt
+
+    with patch("pdh.core.time.sleep", side_effect=sleep):
+        PDH.list_incidents(mock_config, output="raw", watch=True, rules=True, rules_path=str(tmp_path))
+    scripts = [c.args[1] for c in mock_users.return_value.incidents.apply.call_args_list]
+    assert scripts == [[], [str(tmp_path / "sub" / "new.py")]]
+
+
+def test_list_incidents_sort(mock_config, mock_users, incidents, capsys):
+    mock_users.return_value.incidents.list.return_value = incidents
+    PDH.list_incidents(mock_config, output="yaml", fields="id,title", sort_by="title,id", reverse_sort=True)
+    out = capsys.readouterr().out
+    assert out.index("Q0VVEEB5HX4U06") < out.index("Q3W0XN8XORAH3J")
+
+
+def test_urgency_style():
+    assert urgency_style("title", {"urgency": "high"}) == "[red]title[/red]"
+    assert urgency_style("title", {"urgency": "low"}) == "[cyan]title[/cyan]"
+    assert urgency_style("title", {}) == "[cyan]title[/cyan]"
+
+
+def test_split_csv():
+    assert split_csv("ID,Title ") == ["id", "title"]
+    assert split_csv(None, ["id"]) == ["id"]
+    assert split_csv(None) is None
+    fields = ["id"]
+    assert split_csv(fields) == fields and split_csv(fields) is not fields
+
+
+def test_plain_print(capsys):
+    plain_print({"id": "ID1", "title": "[text]", "count": 3}, ["id", "title", "count", "missing"])
+    assert capsys.readouterr().out == "ID1\t[text]\t3\t\n"
+
+
+def test_reassign_by_email(mock_config, mock_users, incidents):
+    pd = mock_users.return_value
+    pd.incidents.bulk_get.return_value = incidents[:1]
+    pd.users.id.return_value = []
+    pd.users.id_by_email.return_value = ["PUSER01"]
+    PDH.reassign(mock_config, ["Q0VVEEB5HX4U06"], "someone@domain.tld")
+    pd.users.id.assert_called_once_with("someone@domain.tld")
+    pd.incidents.bulk_get.assert_called_once_with(["Q0VVEEB5HX4U06"])
+    pd.incidents.list.assert_not_called()
+    assert pd.incidents.reassign.call_args.args[1] == ["PUSER01"]
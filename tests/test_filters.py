@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
+import jsonpath_ng
+
 from pdh.filters import Filter
 from pdh import Transformations
 from typing import Any, List
@@ -97,6 +99,23 @@ def test_filter_not_regexp():
     assert result == [apple, kiwi]
 
 
+def test_filter_compile_regexp():
+    # backreferences are not supported by RE2, must fallback to re
+    r = Filter.compile_regexp(r"(\w)\1")
+    assert r.search("apple")
+    assert not r.search("kiwi")
+    result = Filter.apply(ilist, [Filter.regexp("afield", Filter.compile_regexp("kiwi|orange"))])
+    assert result == [kiwi, orange]
+    assert Filter.compile_regexp("kiwi|orange") is Filter.compile_regexp("kiwi|orange")
+
+
+def test_filter_parse_once(mocker):
+    parse = mocker.spy(jsonpath_ng, "parse")
+    result = Filter.apply(ilist * 10, [Filter.regexp("afield", "apple"), Filter.ge("intfield", 23)])
+    assert result == [apple] * 10
+    assert parse.call_count == 2
+
+
 def test_transformation_extract_field():
     trans = {"afield": Transformations.extract("afield")}
     il = Transformations.apply(ilist, trans)
@@ -15,6 +15,8 @@
 # along with this program. If not, see <http://www.gnu.org/licenses/>.
 #
 import io
+import subprocess
+import sys
 from rich.console import Console
 from pdh import main
 from click import testing
@@ -37,6 +39,24 @@ def test_main_version():
     assert result.stdout == f"v{importlib.metadata.version('pdh')}\n"
 
 
+def test_main_lazy_imports():
+    # heavy modules are loaded only by the commands needing them
+    code = "import sys; from pdh import main; print(' '.join(m for m in ('pdh.core', 'pdh.pd', 'pagerduty', 'jsonpath_ng') if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_main_config_groups(mocker):
+    assert sorted(main.main.commands) == ["config", "inc", "svc", "teams", "user", "version"]
+    load = mocker.patch("pdh.main.load_and_validate", return_value={"uid": "U1"})
+    list_teams = mocker.patch("pdh.core.PDH.list_teams", return_value=True)
+    runner = testing.CliRunner()
+    result = runner.invoke(main.main, ["teams", "-c", "/tmp/pdh.yaml", "mine"])
+    assert result.exit_code == 0
+    load.assert_called_once_with("/tmp/pdh.yaml")
+    assert list_teams.call_args.args[0] == {"uid": "U1"}
+
+
 def test_print_items_table():
     items = [{"Title": "text", "Url": "https://localhost"}]
     expected = "┏━━━━━━━┳━━━━━━━━━━━━━━━━━━━┓\n┃ Title ┃ Url               ┃\n┡━━━━━━━╇━━━━━━━━━━━━━━━━━━━┩\n│ text  │ https://localhost │\n└───────┴───────────────────┘\n"
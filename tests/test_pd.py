@@ -20,6 +20,7 @@ from pytest_mock import MockerFixture
 import json
 
 from requests.models import Response
+from rich import get_console
 from pdh import pd
 from pdh.config import Config
 
@@ -141,6 +142,22 @@ def test_list_my_incidents(incidents: pd.Incidents, config: Dict):
         assert i["assignments"][0]["assignee"]["id"] == config["uid"]
 
 
+def test_session(incidents: pd.Incidents, config: Config, mocker: MockerFixture):
+    assert incidents.session.retry[503] > 0
+    executor = mocker.spy(pd, "ThreadPoolExecutor")
+    for max_concurrency in [1, pd.MAX_CONCURRENCY, 32]:
+        incs = pd.PagerDuty(config, max_concurrency=max_concurrency).incidents
+        pool_maxsize = incs.session.get_adapter("https://api.pagerduty.com/incidents")._pool_maxsize
+        # never smaller than the requests default, and never narrower than the fan-outs
+        assert pool_maxsize >= pd.DEFAULT_POOLSIZE
+        incs.bulk_get([f"ID{n}" for n in range(64)])
+        incs.bulk_alerts([{"id": f"ID{n}"} for n in range(64)])
+        assert executor.call_count == (0 if max_concurrency == 1 else 2)
+        for call in executor.call_args_list:
+            assert call.kwargs["max_workers"] <= pool_maxsize
+        executor.reset_mock()
+
+
 def test_get_incident(incidents: pd.Incidents):
     inc = incidents.get("Q0VVEEB5HX4U06")
     assert inc is not None
@@ -148,13 +165,66 @@ def test_get_incident(incidents: pd.Incidents):
     assert inc[0]["id"] == "Q0VVEEB5HX4U06"
 
 
+def http_error(status_code: int) -> pd.Error:
+    response = Response()
+    response.status_code = status_code
+    return pd.Error(f"HTTP {status_code}", response)
+
+
+def test_bulk_get(incidents: pd.Incidents):
+    found = {"ID1": {"id": "ID1", "status": pd.STATUS_TRIGGERED}, "ID2": {"id": "ID2", "status": pd.STATUS_RESOLVED}, "ID3": {"id": "ID3", "status": pd.STATUS_ACK}}
+
+    def rget(addr: str):
+        id = addr.replace("/incidents/", "")
+        if id == "BROKEN":
+            raise http_error(500)
+        if id not in found:
+            raise http_error(404)
+        return found[id]
+
+    incidents.session.rget.side_effect = rget
+    incs = incidents.bulk_get(["ID1", "NOTEXISTING", "ID2", "ID3", "ID1"])
+    assert [i["id"] for i in incs] == ["ID1", "ID3"]
+    assert [i["id"] for i in incidents.bulk_get(["ID2"], statuses=[pd.STATUS_RESOLVED])] == ["ID2"]
+    with pytest.raises(pd.Error):
+        incidents.bulk_get(["ID1", "BROKEN"])
+
+
 def test_ack(incidents: pd.Incidents):
     inc = incidents.get("Q0VVEEB5HX4U06")
     assert inc is not None
-    incidents.ack(inc)
+    assert incidents.ack(inc) == {"Q0VVEEB5HX4U06": True}
     assert inc[0]["status"] == pd.STATUS_ACK
 
 
+def test_snooze_reassign_errors_buffered(incidents: pd.Incidents, capsys):
+    incs = [{"id": "ID1"}, {"id": "ID2"}, {"id": "ID3"}]
+
+    def post(addr: str, json: dict) -> Response:
+        if "ID2" in addr:
+            raise pd.Error("snooze failed")
+        return Response()
+
+    incidents.session.post.side_effect = post
+    incidents.session.rput.side_effect = pd.Error("reassign failed")
+    # errors of the worker threads are printed by the caller, inside its console buffer
+    with get_console():
+        assert incidents.snooze(incs) == {"ID1": True, "ID2": False, "ID3": True}
+        incidents.reassign(incs, ["U1"])
+        assert capsys.readouterr().out == ""
+    out = capsys.readouterr().out
+    assert out.count("snooze failed") == 1
+    assert out.count("reassign failed") == 3
+
+
+def test_bulk_update_chunks(incidents: pd.Incidents):
+    incs = [{"id": f"ID{n}", "type": "incident_reference"} for n in range(pd.BULK_UPDATE_LIMIT + 1)]
+    ret = incidents.bulk_update(incs)
+    assert incidents.session.rput.call_count == 2
+    assert len(ret) == len(incs)
+    assert all(ret.values())
+
+
 def test_resolve(incidents: pd.Incidents):
     inc = incidents.get("Q0VVEEB5HX4U06")
     assert inc is not None
@@ -162,6 +232,48 @@ def test_resolve(incidents: pd.Incidents):
     assert inc[0]["status"] == pd.STATUS_RESOLVED
 
 
+def test_bulk_alerts(incidents: pd.Incidents):
+    incs = incidents.list()
+    alerts = incidents.bulk_alerts(incs)
+    assert len(alerts) == len(incs)
+    fetched = incidents.session.rget.call_count
+
+    # nothing changed: alerts are reused
+    incidents.bulk_alerts(incs)
+    assert incidents.session.rget.call_count == fetched
+
+    incs[0]["alert_counts"] = {"all": 42}
+    incidents.bulk_alerts(incs)
+    assert incidents.session.rget.call_count == fetched + 1
+
+
+def test_concurrently_preserve_order():
+    assert pd.concurrently(lambda x: x * 2, range(20), max_workers=4) == [x * 2 for x in range(20)]
+
+
+def test_ttl_cache(mocker: MockerFixture):
+    calls = []
+    upstream = {"up": True}
+
+    @pd.ttl_cache(60)
+    def f(x):
+        if not upstream["up"]:
+            raise pd.Error("unreachable")
+        calls.append(x)
+        return x * 2
+
+    assert f(2) == 4
+    assert f(2) == 4
+    assert calls == [2]
+
+    # once expired, fallback to the stale value when the API call fails
+    mocker.patch("pdh.pd.time.monotonic", return_value=10**9)
+    upstream["up"] = False
+    assert f(2) == 4
+    with pytest.raises(pd.Error):
+        f(3)
+
+
 def test_snooze(incidents: pd.Incidents):
     inc = incidents.get("Q0VVEEB5HX4U06")
     assert inc is not None
@@ -83,6 +83,15 @@ def test_extract_date() -> None:
     assert len(result) == 3
 
 
+def test_extract_date_iso() -> None:
+    d = {"at": (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=2, hours=3)).strftime("%Y-%m-%dT%H:%M:%SZ")}
+    t = Transformations.extract_date("at", "%Y-%m-%dT%H:%M:%S%z", datetime.timezone.utc)
+    assert t(d).startswith("2d 3h")
+    # literal Z: naive datetimes, like strptime would return
+    d = {"at": (datetime.datetime.now() - datetime.timedelta(days=2, hours=3)).strftime("%Y-%m-%dT%H:%M:%SZ")}
+    assert Transformations.extract_date("at")(d).startswith("2d 3h")
+
+
 def test_extract_field() -> None:
     t: dict = {"newfield": Transformations.extract("strfield")}
     result = Transformations.apply(ilist, t)
@@ -117,3 +126,12 @@ def test_extract_assignees() -> None:
     assert result[0]["newfield"] == "[magenta]Rakhi[/magenta]"
     assert result[1]["newfield"] == "[magenta]Prasanna[/magenta]"
     assert result[2]["newfield"] == "[magenta]Michele[/magenta]"
+
+
+def test_apply_nested_and_preserve() -> None:
+    t: dict = {"a.b": Transformations.extract("strfield"), "c": Transformations.extract("strfield")}
+    result = Transformations.apply(ilist, t)
+    assert result[0] == {"a": {"b": "apple"}, "c": "apple"}
+    preserved = Transformations.apply([dict(i) for i in ilist], {"c": Transformations.extract("strfield")}, preserve=True)
+    assert preserved[0]["strfield"] == "apple" and preserved[0]["c"] == "apple"
+    assert Transformations.apply(iter(ilist)) == ilist